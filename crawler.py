@@ -1,29 +1,263 @@
+import asyncio
+import codecs
+import collections
 import threading
-import queue
 import os
+import concurrent.futures
+import heapq
+import multiprocessing
+import re
 import time
-import requests
+import aiohttp
+import xxhash
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from pybloom_live import ScalableBloomFilter
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
 import logging
 import csv
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import cpuinfo
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+_USER_AGENT = 'SpiderBot/2.0'
+_A_TAG = 'a'
+_HTTP_SCHEMES = frozenset(('http', 'https'))
+_ABS_HREF_RE = re.compile(r'https?://([^/?#\s]+)(?:[/?#]\S*)?')
+_SLOW_HREF_RE = re.compile(r'/\.|[\t\r\n]')
+_CSV_FLUSH_ROWS = 64
+_UI_BATCH_ROWS = 200
+_UI_DRAIN_MS = 200
+_LOAD_CHUNK_ROWS = 500
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+_RETRY_TOTAL = 2
+_RETRY_BACKOFF = 0.3
+_RETRY_AFTER_MAX = 60.0
+_HTML_TYPES = frozenset(('text/html', 'application/xhtml+xml'))
+_MAX_BODY_BYTES = 5_000_000
+_READ_CHUNK_BYTES = 1 << 16
+_ROBOTS_POLL = 0.1
+_CLOSE_TIMEOUT = 5.0
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w:.-]+)', re.IGNORECASE)
+_META_PRESCAN_BYTES = 1024
+
+
+def _fp(url):
+    """64-bit fingerprint used for URL dedup in place of the full string"""
+    return xxhash.xxh3_64_intdigest(url.encode('utf-8'))
+
+
+def _retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _canon(url):
+    """Dedup key for a URL: lowercase host, sorted query without utm_*, no fragment or trailing slash"""
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if len(path) > 1 and path[-1] == '/':
+        path = path[:-1]
+    query = '&'.join(sorted(param for param in parts.query.split('&')
+                            if param and not param.startswith('utm_')))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+def _url_key(url):
+    """Fingerprint of the canonical form, used for the Bloom filter and frontier set"""
+    return _fp(_canon(url))
+
+
+@lru_cache(maxsize=100_000)
+def _cached_parse(url):
+    """urlparse with memoised results for repeated page and link URLs"""
+    return urlparse(url)
+
+
+def _any_host(netloc):
+    """Host predicate used when crawling is not restricted to one domain"""
+    return True
+
+
+def _known_charset(charset):
+    """The charset name if Python has a codec for it, else None"""
+    try:
+        return charset if charset and codecs.lookup(charset) else None
+    except LookupError:
+        return None
+
+
+def _decode_html(html_bytes, charset=None):
+    """Decode a page with the HTTP charset, else its <meta> charset, else UTF-8"""
+    encoding = charset
+    if encoding is None:
+        match = _META_CHARSET_RE.search(html_bytes, 0, _META_PRESCAN_BYTES)
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return html_bytes.decode(encoding, errors='replace')
+    except LookupError:
+        return html_bytes.decode('utf-8', errors='replace')
+
+
+def _extract_links(html_bytes, base_url, base_domain, charset=None):
+    """Parse a page and return its crawlable links (runs in a worker process)
+
+    charset is the Content-Type charset, if any; without it each parser
+    falls back to the page's <meta> charset.
+    """
+    # Fold the Stay-on-Domain branch out of the per-link loop
+    host_ok = base_domain.__eq__ if base_domain else _any_host
+    page = _cached_parse(base_url)
+    prefix = f"{page.scheme}://{page.netloc}"
+    page_host_ok = host_ok(page.netloc.lower())
+    links = []
+    charset = _known_charset(charset)
+
+    if LexborHTMLParser is not None:
+        # Lexbor treats bytes as UTF-8 and raises on other encodings, so decode first
+        tree = LexborHTMLParser(_decode_html(html_bytes, charset))
+        hrefs = (a.attributes.get('href') for a in tree.css('a[href]'))
+    elif lxml is not None:
+        parser = lxml.html.HTMLParser(encoding=charset) if charset else None
+        tree = lxml.html.fromstring(html_bytes, parser=parser)
+        hrefs = (a.get('href') for a in tree.iter(_A_TAG))
+    else:
+        soup = BeautifulSoup(html_bytes, 'html.parser', from_encoding=charset)
+        hrefs = (a['href'] for a in soup.find_all(_A_TAG, href=True))
+
+    for href in hrefs:
+        if not href:
+            continue
+
+        # Fast paths for root-relative and absolute http(s) hrefs without dot
+        # segments or the tab/newline characters urljoin strips
+        if not _SLOW_HREF_RE.search(href):
+            if href[0] == '/' and href[1:2] != '/':
+                if page_host_ok:
+                    links.append(prefix + href)
+                continue
+            match = _ABS_HREF_RE.fullmatch(href)
+            if match:
+                if host_ok(match.group(1).lower()):
+                    links.append(href)
+                continue
+
+        full_url = urljoin(base_url, href)
+        parsed = _cached_parse(full_url)
+
+        if host_ok(parsed.netloc.lower()) and parsed.scheme in _HTTP_SCHEMES:
+            links.append(full_url)
+
+    return links
+
+
+class _HostScheduler:
+    """Per-host frontier queues ordered by when each host may next be fetched"""
+
+    def __init__(self):
+        self.queues = {}
+        self.ready = []
+        self.last_hit = {}
+        self.size = 0
+
+    def push(self, url):
+        host = _cached_parse(url).netloc
+        urls = self.queues.get(host)
+        if urls is None:
+            urls = self.queues[host] = collections.deque()
+            heapq.heappush(self.ready, (0.0, host))
+        urls.append(url)
+        self.size += 1
+
+    def pop(self, now, delay_for):
+        """Return (url, None) for a URL whose host is due, else (None, seconds until one may be)"""
+        while self.ready:
+            due, host = self.ready[0]
+            if due > now:
+                return None, due - now
+            heapq.heappop(self.ready)
+            urls = self.queues[host]
+            delay = delay_for(urls[0])
+            if host in self.last_hit:
+                # A host's second fetch has to wait for its robots.txt Crawl-delay
+                if delay is None:
+                    heapq.heappush(self.ready, (now + _ROBOTS_POLL, host))
+                    continue
+                due = self.last_hit[host] + delay
+                if due > now:
+                    heapq.heappush(self.ready, (due, host))
+                    continue
+            url = urls.popleft()
+            self.size -= 1
+            self.last_hit[host] = now
+            if urls:
+                heapq.heappush(self.ready, (now + (delay or 0.0), host))
+            else:
+                del self.queues[host]
+            return url, None
+        return None, None
+
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
 class WebCrawler:
     def __init__(self):
-        self.url_queue = queue.Queue()
-        self.visited_urls = set()
+        self.url_queue = collections.deque()
+        self.visited_bf = ScalableBloomFilter(initial_capacity=1_000_000, error_rate=1e-4)
+        self.frontier_urls = set()
         self.visited_lock = threading.Lock()
         self.crawler_running = False
+        self.loop = None
+        self.crawl_future = None
+        self._stop = None
+        self._delay = 0.0
+        self._storage_path = None
+        self._restrict_domain = True
+        self._base_domain = None
+        self._robots = {}
+        self._scheduler = _HostScheduler()
+        self.session = None
+        # Spawn rather than fork: the pool starts lazily while Tk and loop threads are live
+        self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                                           mp_context=multiprocessing.get_context('spawn'))
+        self._csv_fh = None
+        self._csv_writer = None
+        self._csv_rows = 0
+        self._csv_lock = threading.Lock()
+        self._ui_pending = collections.deque()
+        self._load_chunks = collections.deque()
+        self._log_pending = collections.deque()
+        self._status_pending = collections.deque()
         self.setup_ui()
         self.setup_stats()
+        self.drain_ui_queue()
 
     def setup_ui(self):
         """Initialize the modern UI components"""
@@ -31,6 +265,7 @@ class WebCrawler:
         self.root.title("SpiderBot - Modern Web Crawler")
         self.root.geometry("1200x800")
         self.root.configure(bg="#1a1a1a")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Custom style configuration
         self.style = ttk.Style()
@@ -156,94 +391,273 @@ class WebCrawler:
     def update_stats(self):
         """Periodically update UI statistics"""
         if self.crawler_running:
-            self.queue_count.set(str(self.url_queue.qsize()))
-            self.visited_count.set(str(len(self.visited_urls)))
+            self.queue_count.set(str(len(self.url_queue) + self._scheduler.size))
+            self.visited_count.set(str(len(self.visited_bf)))
             self.root.after(500, self.update_stats)
 
-    def crawl_page(self, url):
+    async def request(self, url, delay):
+        """GET a URL with retries; returns (status, HTML body under the size cap or None, final URL, charset)"""
+        host = _cached_parse(url).netloc
+        for attempt in range(_RETRY_TOTAL + 1):
+            backoff = _RETRY_BACKOFF * 2 ** attempt
+            try:
+                async with self.session.get(url) as response:
+                    retry_after = _retry_after(response.headers.get('Retry-After'))
+                    if (response.status in _RETRY_STATUSES and attempt < _RETRY_TOTAL
+                            and (retry_after or 0) <= _RETRY_AFTER_MAX):
+                        backoff = max(backoff, retry_after or 0)
+                    elif response.status != 200:
+                        return response.status, None, None, None
+                    elif (response.content_type not in _HTML_TYPES
+                          or (response.content_length or 0) >= _MAX_BODY_BYTES):
+                        return response.status, None, None, None
+                    else:
+                        body = await self.read_body(response)
+                        return response.status, body, str(response.url), response.charset
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == _RETRY_TOTAL:
+                    raise
+            # Retries still go through the host's politeness slot
+            await self.wait_for_host(host, delay, backoff)
+
+    async def read_body(self, response):
+        """Read raw (already decompressed) body bytes, stopping at the size cap"""
+        chunks = []
+        remaining = _MAX_BODY_BYTES
+        while remaining > 0:
+            chunk = await response.content.read(min(_READ_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
+
+    async def fetch(self, url, delay):
         """Fetch and parse a single webpage"""
         try:
-            response = requests.get(url, timeout=5, headers={'User-Agent': 'SpiderBot/2.0'})
-            status = response.status_code
-            if status != 200:
+            status, content, final_url, charset = await self.request(url, delay)
+            if content is None:
                 return [], status
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            base_domain = urlparse(url).netloc if self.restrict_domain.get() else None
-            links = []
-
-            for link in soup.find_all('a', href=True):
-                full_url = urljoin(url, link['href'])
-                parsed = urlparse(full_url)
-
-                if (not base_domain or parsed.netloc == base_domain) and parsed.scheme in ('http', 'https'):
-                    links.append(full_url)
-
+            # Relative links resolve against where redirects actually landed
+            links = await self.loop.run_in_executor(self.pool, _extract_links, content, final_url,
+                                                    self._base_domain, charset)
             return links, status
         except Exception as e:
             self.log(f"Error crawling {url}: {str(e)}")
             return [], 0
 
-    def worker(self):
-        """Process URLs from the queue"""
-        while self.crawler_running:
-            try:
-                url = self.url_queue.get(timeout=2)
-
-                with self.visited_lock:
-                    if url in self.visited_urls:
-                        self.url_queue.task_done()
-                        continue
-                    self.visited_urls.add(url)
-
-                links, status = self.crawl_page(url)
-                self.save_url(url, status)
+    async def worker(self, url):
+        """Process a single URL taken from the queue"""
+        try:
+            # The key stays in the frontier set until the page is saved, so a
+            # worker cancelled by Stop leaves the URL crawlable next time
+            fp = _url_key(url)
+            with self.visited_lock:
+                if fp in self.visited_bf:
+                    self.frontier_urls.discard(fp)
+                    return
+
+            page = _cached_parse(url)
+            robots = await self.robots_for(f"{page.scheme}://{page.netloc}")
+            if not robots.can_fetch(_USER_AGENT, url):
+                self.log(f"Blocked by robots.txt: {url}")
+                self.mark_visited(fp)
+                return
 
-                with self.visited_lock:
-                    for link in links:
-                        if link not in self.visited_urls:
-                            self.url_queue.put(link)
+            # The dispatcher only hands out URLs whose host delay has elapsed
+            links, status = await self.fetch(url, self.host_delay(url))
+            self.save_url(url, status)
+            self.mark_visited(fp)
+
+            # Dedupe the page's links and Bloom-check them outside the lock,
+            # leaving a single set difference in the critical section
+            fresh = {_url_key(link): link for link in links}
+            fresh = {key: link for key, link in fresh.items() if key not in self.visited_bf}
+            with self.visited_lock:
+                new = fresh.keys() - self.frontier_urls
+                self.frontier_urls |= new
+            self.url_queue.extend([fresh[key] for key in new])
+        except Exception as e:
+            self.log(f"Worker error: {str(e)}")
+
+    def mark_visited(self, fp):
+        """Move a URL key from the frontier set into the visited filter"""
+        with self.visited_lock:
+            self.visited_bf.add(fp)
+            self.frontier_urls.discard(fp)
+
+    def host_delay(self, url):
+        """Politeness delay for a URL's host, or None while its robots.txt is still loading"""
+        page = _cached_parse(url)
+        robots = self.robots_for(f"{page.scheme}://{page.netloc}")
+        if not robots.done():
+            return None
+        if robots.cancelled() or robots.exception() is not None:
+            return self._delay
+        crawl_delay = robots.result().crawl_delay(_USER_AGENT)
+        return max(self._delay, float(crawl_delay or 0))
+
+    async def wait_for_host(self, host, delay, not_before=0.0):
+        """Reserve the host's next fetch slot and sleep only until it comes up"""
+        last_hit = self._scheduler.last_hit
+        now = time.monotonic()
+        slot = max(now + not_before, last_hit.get(host, 0.0) + delay)
+        last_hit[host] = slot
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def robots_for(self, origin):
+        """Return a future for the host's robots.txt rules, fetched once per crawl"""
+        if origin not in self._robots:
+            self._robots[origin] = asyncio.ensure_future(self.load_robots(origin))
+        return self._robots[origin]
+
+    async def load_robots(self, origin):
+        """Fetch and parse robots.txt the same way RobotFileParser.read() does"""
+        robots = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            async with self.session.get(robots.url) as response:
+                if response.status in (401, 403):
+                    robots.disallow_all = True
+                elif response.status >= 400:
+                    robots.allow_all = True
+                else:
+                    robots.parse((await response.text(errors='replace')).splitlines())
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            robots.allow_all = True
+        return robots
+
+    async def crawl(self, concurrency):
+        """Dispatch queued URLs to workers until the frontier is exhausted or stopped"""
+        self._stop = asyncio.Event()
+        if not self.crawler_running:  # Stop was pressed before this coroutine started
+            self._stop.set()
+        stop_wait = asyncio.ensure_future(self._stop.wait())
+        semaphore = asyncio.Semaphore(concurrency)
+        pending = set()
+
+        await self.loop.run_in_executor(None, self.load_urls)
+
+        # One keep-alive pool for the whole crawl; Stay-on-Domain reuses the same sockets
+        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency,
+                                         ttl_dns_cache=300, keepalive_timeout=30)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=5),
+                                         headers={'User-Agent': _USER_AGENT}) as self.session:
+            while not self._stop.is_set():
+                while self.url_queue:
+                    self._scheduler.push(self.url_queue.popleft())
+
+                # Workers are the only producers, so an empty frontier can only
+                # refill once one of them finishes
+                if not self._scheduler.size:
+                    if not pending:
+                        break
+                    await asyncio.wait(pending | {stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                acquire = asyncio.ensure_future(semaphore.acquire())
+                await asyncio.wait({acquire, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+                if not acquire.done():
+                    acquire.cancel()
+                    break
+
+                # Hosts still inside their delay wait here without holding a slot,
+                # so one slow host cannot starve the rest
+                url, wait = self._scheduler.pop(time.monotonic(), self.host_delay)
+                if url is None:
+                    semaphore.release()
+                    await asyncio.wait(pending | {stop_wait}, timeout=wait,
+                                       return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                task = asyncio.create_task(self.worker(url))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                task.add_done_callback(lambda _: semaphore.release())
+
+            # On stop, abandon in-flight fetches and host delays instead of draining them
+            if self._stop.is_set():
+                for task in pending:
+                    task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        stop_wait.cancel()
+        self.close_storage()
 
-                time.sleep(float(self.politeness_delay_entry.get()))
-                self.url_queue.task_done()
+        if self.crawler_running:
+            self.crawler_running = False
+            self._status_pending.append("Finished")
+            self.log("Crawl finished - no more URLs in queue")
+        else:
+            self.log("Crawler stopped")
 
-            except queue.Empty:
-                break
-            except Exception as e:
-                self.log(f"Worker error: {str(e)}")
-                self.url_queue.task_done()
+    def start_loop(self):
+        """Run the asyncio event loop on a background thread"""
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+            threading.Thread(target=self.loop.run_forever, daemon=True).start()
 
     def save_url(self, url, status):
         """Save crawled URL to CSV and update UI"""
         try:
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            file_exists = os.path.exists(self.storage_file_entry.get())
 
-            with open(self.storage_file_entry.get(), 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                if not file_exists:
-                    writer.writerow(['URL', 'Timestamp', 'Status'])
-                writer.writerow([url, timestamp, status])
+            with self._csv_lock:
+                if self._csv_writer is not None:
+                    self._csv_writer.writerow([url, timestamp, status])
+                    self._csv_rows += 1
+                    if self._csv_rows % _CSV_FLUSH_ROWS == 0:
+                        self._csv_fh.flush()
 
-            self.url_table.insert('', 'end', values=(url, timestamp, status))
-            self.url_table.yview_moveto(1)
+            self._ui_pending.append((url, timestamp, status))
             self.log(f"Crawled: {url} (Status: {status})")
         except Exception as e:
             self.log(f"Error saving {url}: {str(e)}")
 
+    def open_storage(self):
+        """Open the CSV file once for the whole crawl"""
+        with self._csv_lock:
+            self._csv_fh = open(self._storage_path, 'a', newline='',
+                                buffering=1 << 16, encoding='utf-8')
+            self._csv_writer = csv.writer(self._csv_fh)
+            self._csv_rows = 0
+            if self._csv_fh.tell() == 0:
+                self._csv_writer.writerow(['URL', 'Timestamp', 'Status'])
+
+    def close_storage(self):
+        """Flush and close the CSV file"""
+        with self._csv_lock:
+            if self._csv_fh is not None:
+                self._csv_fh.close()
+                self._csv_fh = None
+                self._csv_writer = None
+
     def load_urls(self):
-        """Load previously crawled URLs from storage"""
+        """Stream previously crawled URLs from storage (runs off the Tk thread)"""
         try:
-            filename = self.storage_file_entry.get()
+            filename = self._storage_path
             if os.path.exists(filename):
+                visited_local = set()
+                chunk = []
                 with open(filename, 'r', encoding='utf-8') as f:
                     reader = csv.reader(f)
-                    next(reader)  # Skip header
+                    next(reader, None)  # Skip header
                     for row in reader:
                         if row:
-                            self.visited_urls.add(row[0])
-                            self.url_table.insert('', 'end', values=row)
-                self.log(f"Loaded {len(self.visited_urls)} URLs from storage")
+                            visited_local.add(_url_key(row[0]))
+                            chunk.append(row)
+                            if len(chunk) == _LOAD_CHUNK_ROWS:
+                                self._load_chunks.append(chunk)
+                                chunk = []
+                if chunk:
+                    self._load_chunks.append(chunk)
+
+                with self.visited_lock:
+                    for fp in visited_local:
+                        self.visited_bf.add(fp)
+                self.log(f"Loaded {len(visited_local)} URLs from storage")
         except Exception as e:
             self.log(f"Error loading URLs: {str(e)}")
 
@@ -253,6 +667,9 @@ class WebCrawler:
             if self.crawler_running:
                 messagebox.showinfo("Info", "Crawler is already running")
                 return
+            if self.crawl_future is not None and not self.crawl_future.done():
+                messagebox.showinfo("Info", "Crawler is still stopping, try again shortly")
+                return
 
             # Input validation
             start_url = self.start_url_entry.get().strip()
@@ -276,22 +693,33 @@ class WebCrawler:
                 messagebox.showerror("Error", "Delay must be ≥0")
                 return
 
+            # Snapshot settings so the crawl thread never reads Tk widgets
+            self._delay = delay
+            self._storage_path = self.storage_file_entry.get()
+            self._restrict_domain = self.restrict_domain.get()
+            self._base_domain = _cached_parse(start_url).netloc.lower() if self._restrict_domain else None
+            self.open_storage()
+
             # Initialize crawling
             self.crawler_running = True
             self.current_status.set("Running")
-            self.url_queue.queue.clear()
-            self.url_queue.put(start_url)
-            self.load_urls()
+            self.url_queue = collections.deque([start_url])
+            self.frontier_urls = {_url_key(start_url)}
+            self._robots = {}
+            self._scheduler = _HostScheduler()
 
-            # Start worker threads
-            for _ in range(max_threads):
-                thread = threading.Thread(target=self.worker, daemon=True)
-                thread.start()
+            # Async I/O handles far more in-flight requests than the thread cap
+            self.start_loop()
+            self.crawl_future = asyncio.run_coroutine_threadsafe(self.crawl(max_threads * 4), self.loop)
 
             self.update_stats()
             self.log("Crawler started successfully")
 
         except Exception as e:
+            if self.crawl_future is None or self.crawl_future.done():
+                self.crawler_running = False
+                self.close_storage()
+                self.current_status.set("Idle")
             self.log(f"Startup error: {str(e)}")
             messagebox.showerror("Error", f"Failed to start crawler: {str(e)}")
 
@@ -299,17 +727,31 @@ class WebCrawler:
         """Stop crawling gracefully"""
         if self.crawler_running:
             self.crawler_running = False
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self.signal_stop)
             self.current_status.set("Stopped")
             self.log("Crawler stopping...")
 
+    def signal_stop(self):
+        """Wake the dispatcher on the event loop thread"""
+        if self._stop is not None:
+            self._stop.set()
+
     def clear_storage(self):
         """Reset all data and storage"""
+        if self.crawler_running or (self.crawl_future is not None and not self.crawl_future.done()):
+            messagebox.showinfo("Info", "Stop the crawler before clearing data")
+            return
         if messagebox.askyesno("Confirm", "Delete all crawled data?"):
             try:
                 filename = self.storage_file_entry.get()
                 if os.path.exists(filename):
                     os.remove(filename)
-                self.visited_urls.clear()
+                self.visited_bf = ScalableBloomFilter(initial_capacity=1_000_000, error_rate=1e-4)
+                self.frontier_urls.clear()
+                _cached_parse.cache_clear()
+                self._ui_pending.clear()
+                self._load_chunks.clear()
                 self.url_table.delete(*self.url_table.get_children())
                 self.log("Storage cleared successfully")
                 self.setup_stats()
@@ -317,15 +759,48 @@ class WebCrawler:
                 self.log(f"Clear error: {str(e)}")
 
     def log(self, message):
-        """Add timestamped message to log"""
+        """Queue timestamped message for the log panel"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_area.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.log_area.see(tk.END)
-        self.log_area.update_idletasks()
+        self._log_pending.append(f"[{timestamp}] {message}\n")
+
+    def drain_ui_queue(self):
+        """Flush queued table rows, status and log lines from the Tk main loop"""
+        # Rows loaded from storage go first, one chunk per tick, ahead of new results
+        if self._load_chunks:
+            rows = self._load_chunks.popleft()
+        else:
+            rows = [self._ui_pending.popleft() for _ in range(min(len(self._ui_pending), _UI_BATCH_ROWS))]
+        for row in rows:
+            self.url_table.insert('', 'end', values=row)
+        if rows:
+            self.url_table.yview_moveto(1)
+
+        statuses = [self._status_pending.popleft() for _ in range(len(self._status_pending))]
+        if statuses:
+            self.current_status.set(statuses[-1])
+
+        lines = [self._log_pending.popleft() for _ in range(len(self._log_pending))]
+        if lines:
+            self.log_area.insert(tk.END, ''.join(lines))
+            self.log_area.see(tk.END)
+
+        self.root.after(1 if self._load_chunks else _UI_DRAIN_MS, self.drain_ui_queue)
+
+    def on_close(self):
+        """Stop any running crawl and flush the CSV before the window goes away"""
+        self.stop_crawler()
+        if self.crawl_future is not None:
+            try:
+                self.crawl_future.result(timeout=_CLOSE_TIMEOUT)
+            except Exception:
+                pass
+        self.close_storage()
+        self.root.destroy()
 
     def run(self):
         """Start application"""
         self.root.mainloop()
+        self.pool.shutdown(wait=False)
 
 
 if __name__ == "__main__":
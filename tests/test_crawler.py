@@ -0,0 +1,95 @@
+import unittest
+
+from crawler import _HostScheduler, _canon, _extract_links, _retry_after, _url_key
+
+
+class CanonTest(unittest.TestCase):
+    def test_trailing_slash_shares_key(self):
+        self.assertEqual(_canon('https://example.com/docs/'), 'https://example.com/docs')
+        self.assertEqual(_url_key('https://example.com/docs/'), _url_key('https://example.com/docs'))
+
+    def test_root_path(self):
+        self.assertEqual(_canon('https://Example.com'), 'https://example.com/')
+
+    def test_query_normalization(self):
+        self.assertEqual(_canon('http://h/p?b=%20&x&utm_source=feed&a=1#top'), 'http://h/p?a=1&b=%20&x')
+
+    def test_key_ignores_fragment_and_tracking(self):
+        self.assertEqual(_url_key('http://h/p?a=1#one'), _url_key('http://H/p?utm_medium=x&a=1'))
+
+
+class ExtractLinksTest(unittest.TestCase):
+    def test_relative_href_on_directory_page(self):
+        links = _extract_links(b'<a href="intro.html">Intro</a>', 'https://example.com/docs/', 'example.com')
+        self.assertEqual(links, ['https://example.com/docs/intro.html'])
+
+    def test_links_keep_original_form(self):
+        html = b'<a href="/search?q=a%20b&x">s</a><a href="https://example.com/guide/#part">g</a>'
+        links = _extract_links(html, 'https://example.com/', 'example.com')
+        self.assertEqual(links, ['https://example.com/search?q=a%20b&x', 'https://example.com/guide/#part'])
+
+    def test_dot_segments_and_domain_filter(self):
+        html = (b'<a href="../up.html">u</a><a href="http://other.org/x">o</a>'
+                b'<a href="mailto:me@example.com">m</a><a href="">e</a>')
+        links = _extract_links(html, 'https://example.com/a/b/', 'example.com')
+        self.assertEqual(links, ['https://example.com/a/up.html'])
+
+    def test_control_characters_stripped(self):
+        links = _extract_links(b'<a href="/foo\n">f</a><a href="/b\tar">b</a>', 'https://example.com/', 'example.com')
+        self.assertEqual(links, ['https://example.com/foo', 'https://example.com/bar'])
+
+    def test_unrestricted_domain(self):
+        links = _extract_links(b'<a href="http://other.org/x">o</a>', 'https://example.com/', None)
+        self.assertEqual(links, ['http://other.org/x'])
+
+    def test_non_utf8_page(self):
+        html = '<meta charset="windows-1252"><a href="/café">c</a>'.encode('cp1252')
+        links = _extract_links(html, 'https://example.com/', 'example.com')
+        self.assertEqual(links, ['https://example.com/café'])
+
+    def test_http_charset_overrides_meta(self):
+        html = '<meta charset="utf-8"><a href="/café">c</a>'.encode('cp1252')
+        links = _extract_links(html, 'https://example.com/', 'example.com', 'windows-1252')
+        self.assertEqual(links, ['https://example.com/café'])
+
+
+class HostSchedulerTest(unittest.TestCase):
+    def test_busy_host_does_not_block_others(self):
+        scheduler = _HostScheduler()
+        for i in range(20):
+            scheduler.push(f'https://a.example/{i}')
+        scheduler.push('https://b.example/0')
+        delay_for = lambda url: 1.0
+
+        self.assertEqual(scheduler.pop(0.0, delay_for), ('https://a.example/0', None))
+        self.assertEqual(scheduler.pop(0.0, delay_for), ('https://b.example/0', None))
+        self.assertEqual(scheduler.pop(0.5, delay_for), (None, 0.5))
+        self.assertEqual(scheduler.pop(1.0, delay_for), ('https://a.example/1', None))
+        self.assertEqual(scheduler.size, 18)
+
+    def test_waits_for_unknown_delay_after_first_fetch(self):
+        scheduler = _HostScheduler()
+        scheduler.push('https://a.example/0')
+        scheduler.push('https://a.example/1')
+        delay_for = lambda url: None
+
+        self.assertEqual(scheduler.pop(0.0, delay_for), ('https://a.example/0', None))
+        url, wait = scheduler.pop(0.0, delay_for)
+        self.assertIsNone(url)
+        self.assertGreater(wait, 0)
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_delta_seconds(self):
+        self.assertEqual(_retry_after('120'), 120.0)
+
+    def test_past_http_date(self):
+        self.assertEqual(_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(_retry_after(None))
+        self.assertIsNone(_retry_after('soon'))
+
+
+if __name__ == '__main__':
+    unittest.main()